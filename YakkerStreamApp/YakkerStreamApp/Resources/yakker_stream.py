@@ -12,15 +12,29 @@ import asyncio
 import inspect
 import json
 import logging
+import math
 import os
 import re
 import signal
 import sys
 import time
-from typing import Awaitable, Callable, Dict, List, Optional, TypedDict, Union
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from aiohttp import ClientConnectorError, ClientSession, WSMsgType, web
 
+try:
+    # Optional: faster JSON decoding for websocket frames
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: faster event loop for the websocket feed and HTTP server
+    import uvloop
+except ImportError:
+    uvloop = None
+
 DEFAULT_WS_URL = os.getenv(
     "YAKKER_WS_URL", ""
 )
@@ -36,14 +50,22 @@ DEFAULT_SIDEARM_FILE = os.getenv("YAKKER_SIDEARM_FILE", "")
 SIDEARM_FETCH_INTERVAL = 30  # seconds between Sidearm XML fetches
 ZONE_SPEED_KEY = "ZoneSpeedMPH"
 REL_SPEED_KEY = "RelSpeedMPH"
-PITCH_VELOCITY_KEYS = (ZONE_SPEED_KEY, REL_SPEED_KEY)
 SPIN_RATE_KEY = "SpinRateRPM"
-PITCH_METRIC_KEYS = PITCH_VELOCITY_KEYS + (SPIN_RATE_KEY,)
 # Yakker merges pitch + hit observations; catcher throwbacks surface as a single contributing event,
 # so require at least two event IDs (pitch + hit) when no pitch metrics accompany hit data.
 MIN_CONTRIBUTING_EVENTS_FOR_HIT = 2
 # Filter throwbacks based on low exit velocity (soft throws back to pitcher/catcher)
 THROWBACK_MAX_EXIT_VELO = 65.0
+# livedata.xml is generated next to the script from its template
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LIVEDATA_TEMPLATE_PATH = os.path.join(SCRIPT_DIR, "livedata.xml.template")
+LIVEDATA_PATH = os.path.join(SCRIPT_DIR, "livedata.xml")
+
+# String readings Yakker uses for "no value"; anything else must be a finite
+# decimal number (no inf/nan spellings, no underscores)
+_INVALID_STRINGS = frozenset({"", "n/a", "na", "nan"})
+_FLOAT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)(e[+-]?\d+)?$")
+
 
 PayloadHook = Callable[[dict], Union[Awaitable[None], None]]
 
@@ -56,31 +78,34 @@ def _extract_auth_value(raw_header: str) -> Optional[str]:
     return raw_header.strip()
 
 
-def _is_valid(value: Optional[float]) -> bool:
-    if value is None:
-        return False
-    if isinstance(value, str):
-        lowered = value.lower()
-        if lowered in {"n/a", "na", "nan"}:
-            return False
-    try:
-        float(value)
-    except (TypeError, ValueError):
-        return False
-    return True
+def _json_loads(data: str):
+    """Decode a websocket frame, preferring orjson when it is installed.
+
+    orjson rejects the bare NaN/Infinity tokens Yakker sends for unmeasured
+    fields, so a frame orjson can't parse is retried with json, and only a
+    json.JSONDecodeError from that reaches the caller.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
-def _looks_like_throwback(hit_data: dict, min_exit_velo: Optional[float] = None) -> bool:
-    """Return True when the hit profile matches a soft throwback to the mound."""
-    if min_exit_velo is None:
-        return False
-    exit_velocity = hit_data.get("ExitSpeedMPH")
-    if not _is_valid(exit_velocity):
-        return False
-    exit_velocity = float(exit_velocity)
-    # Filter throwbacks based solely on low exit velocity
-    # Throwbacks are characterized by low exit velocity regardless of angle
-    return exit_velocity < min_exit_velo
+def _is_valid(value: Optional[float]) -> bool:
+    value_type = type(value)
+    # Yakker sends numeric JSON almost always, so check those first
+    if value_type is float:
+        return math.isfinite(value)  # json decodes bare NaN/Infinity tokens
+    if value_type is int:
+        return True
+    if value_type is str:
+        lowered = value.strip().lower()
+        if lowered in _INVALID_STRINGS:
+            return False
+        return _FLOAT_RE.match(lowered) is not None
+    return False
 
 
 def _is_true_hit(hit_data: dict, pitch_data: dict, contributing_events: List[str], min_exit_velo: Optional[float] = None) -> bool:
@@ -90,36 +115,80 @@ def _is_true_hit(hit_data: dict, pitch_data: dict, contributing_events: List[str
     """
     if not hit_data:
         return False
-    if _looks_like_throwback(hit_data, min_exit_velo=min_exit_velo):
-        return False
 
-    if _is_valid(hit_data.get("ExitSpeedMPH")):
-        return True
-
-    has_valid_pitch_metrics = any(
-        _is_valid(pitch_data.get(key)) for key in PITCH_METRIC_KEYS
-    )
-    if has_valid_pitch_metrics:
+    is_valid = _is_valid
+    exit_velocity = hit_data.get("ExitSpeedMPH")
+    if is_valid(exit_velocity):
+        # Filter throwbacks based solely on low exit velocity
+        # Throwbacks are characterized by low exit velocity regardless of angle
+        return min_exit_velo is None or float(exit_velocity) >= min_exit_velo
+
+    get_pitch = pitch_data.get
+    if (
+        is_valid(get_pitch(ZONE_SPEED_KEY))
+        or is_valid(get_pitch(REL_SPEED_KEY))
+        or is_valid(get_pitch(SPIN_RATE_KEY))
+    ):
         return True
     return len(contributing_events) >= MIN_CONTRIBUTING_EVENTS_FOR_HIT
 
 
-async def _dispatch_payload_hooks(
-    payload_hooks: Optional[List[PayloadHook]], payload: dict
-) -> None:
-    if not payload_hooks:
-        return
-    for hook in payload_hooks:
+class _PayloadHookSet(NamedTuple):
+    """Payload hooks split once by kind, so dispatch needs no per-call awaitable check."""
+    sync_hooks: Tuple[PayloadHook, ...]
+    async_hooks: Tuple[PayloadHook, ...]
+
+
+def _classify_payload_hooks(payload_hooks: Optional[List[PayloadHook]]) -> _PayloadHookSet:
+    sync_hooks: List[PayloadHook] = []
+    async_hooks: List[PayloadHook] = []
+    for hook in payload_hooks or ():
+        if inspect.iscoroutinefunction(hook):
+            async_hooks.append(hook)
+        else:
+            sync_hooks.append(hook)
+    return _PayloadHookSet(tuple(sync_hooks), tuple(async_hooks))
+
+
+def _report_hook_failure(hook: PayloadHook, exc: Exception) -> None:
+    name = getattr(hook, "__name__", repr(hook))
+    print(f"⚠️  Payload hook {name} failed: {exc}", file=sys.stderr, flush=True)
+
+
+async def _dispatch_payload_hooks(hooks: _PayloadHookSet, payload: dict) -> None:
+    for hook in hooks.sync_hooks:
         try:
             result = hook(payload)
-            if inspect.isawaitable(result):
+            # Plain callables may still hand back an awaitable (e.g. a partial
+            # wrapping a coroutine function)
+            if result is not None and inspect.isawaitable(result):
                 await result
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:
-            # Silently ignore payload hook failures
-            pass
+            _report_hook_failure(hook, exc)
+    for hook in hooks.async_hooks:
+        try:
+            await hook(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            _report_hook_failure(hook, exc)
 
 
 class MetricAggregator:
+    """Per-event metric store with rolling and stale-timeout summaries.
+
+    Intended for use from a single event loop: the feed task is the only
+    writer and the HTTP handlers read from the same loop. No method awaits
+    while mutating state, so no lock is needed. The original methods stay
+    ``async`` to keep their call sites unchanged; ``expire()`` and
+    ``revision()`` never await and are plain methods.
+
+    All timestamps (``updated_at``, sample times) come from ``time.monotonic()``
+    so stale/rolling windows are immune to wall-clock adjustments.
+    """
+
     TRACKED_METRICS = (
         "exit_velocity_mph",
         "launch_angle_deg",
@@ -129,27 +198,29 @@ class MetricAggregator:
         "hangtime_sec",
     )
     ROLLING_WINDOW_SECONDS = 1.0
+    # Per-event buckets kept for late readings; older events are evicted
+    MAX_TRACKED_EVENTS = 128
 
-    class MetricEntry(TypedDict):
+    class MetricEntry(NamedTuple):
         value: float
         event_id: str
         updated_at: float
-    
-    class MetricSample(TypedDict):
-        value: float
-        timestamp: float
 
     def __init__(self, stale_timeout: int = DEFAULT_STALE_TIMEOUT) -> None:
         self.stale_timeout_seconds = stale_timeout
-        self.events: Dict[str, Dict[str, Optional[float]]] = {}
+        self.events: "OrderedDict[str, Dict[str, Optional[float]]]" = OrderedDict()
         self.latest_event_id: Optional[str] = None
+        # Last 6 characters of latest_event_id, for console output
+        self.latest_event_short_id: Optional[str] = None
         self.last_update_ts: Optional[float] = None
+        # Bumped whenever either summary may have changed, so readers can
+        # reuse anything they rendered from them until the next bump
+        self._revision = 0
         self.latest_metrics: Dict[str, "MetricAggregator.MetricEntry"] = {}
-        # Rolling buffer for 1-second recency filtering
-        self.rolling_buffer: Dict[str, List["MetricAggregator.MetricSample"]] = {
-            metric: [] for metric in self.TRACKED_METRICS
-        }
-        self._lock = asyncio.Lock()
+        # Most recent non-zero sample per metric as (value, timestamp), kept only
+        # while it is inside the 1-second rolling window. Older samples in the
+        # window are never read, so they are not stored.
+        self.rolling_samples: Dict[str, Tuple[float, float]] = {}
 
     async def add_measurement(
         self,
@@ -162,153 +233,152 @@ class MetricAggregator:
         hangtime: Optional[float] = None,
     ) -> Dict[str, Optional[float]]:
         event_key = event_id or f"event-{int(time.time() * 1000)}"
-        now = time.time()
-        async with self._lock:
-            bucket = self.events.setdefault(
-                event_key,
-                {
-                    "exit_velocity_mph": None,
-                    "launch_angle_deg": None,
-                    "pitch_velocity_mph": None,
-                    "spin_rate_rpm": None,
-                    "hit_distance_ft": None,
-                    "hangtime_sec": None,
-                },
-            )
-            # Store latest valid reading per metric for this event
-            for key, value in {
-                "exit_velocity_mph": exit_velocity,
-                "launch_angle_deg": launch_angle,
-                "pitch_velocity_mph": pitch_velocity,
-                "spin_rate_rpm": spin_rate,
-                "hit_distance_ft": hit_distance,
-                "hangtime_sec": hangtime,
-            }.items():
-                if _is_valid(value):
-                    val = float(value)
-                    bucket[key] = val
-                    # Track latest sample for short-term recency filtering
-                    if val != 0:
-                        self.rolling_buffer[key].append({
-                            "value": val,
-                            "timestamp": now
-                        })
-
+        now = time.monotonic()
+        bucket = self.events.get(event_key)
+        if bucket is None:
+            bucket = dict.fromkeys(self.TRACKED_METRICS)
+            self.events[event_key] = bucket
+            if len(self.events) > self.MAX_TRACKED_EVENTS:
+                self.events.popitem(last=False)
+        else:
+            self.events.move_to_end(event_key)
+        # Store latest valid reading per metric for this event
+        for key, value in zip(
+            self.TRACKED_METRICS,
+            (exit_velocity, launch_angle, pitch_velocity, spin_rate, hit_distance, hangtime),
+        ):
+            if _is_valid(value):
+                val = float(value)
+                bucket[key] = val
+                # Track latest sample for short-term recency filtering
+                if val != 0:
+                    self.rolling_samples[key] = (val, now)
+
+        if event_key != self.latest_event_id:
             self.latest_event_id = event_key
-            self.last_update_ts = now
-            summary = self._summary_for(event_key, bucket)
-            self._update_latest_metrics(summary)
-            self._cleanup_rolling_buffer(now)
-            return self._current_summary(now)
+            self.latest_event_short_id = event_key[-6:]
+        self.last_update_ts = now
+        self._revision += 1
+
+        # Refresh latest_metrics from this event and build the current summary
+        # in the same pass
+        summary: Dict[str, Optional[float]] = {"event_id": event_key}
+        for key in self.TRACKED_METRICS:
+            value = bucket[key]
+            if value is not None:
+                self.latest_metrics[key] = self.MetricEntry(value, event_key, now)
+            else:
+                value = self._latest_value(key, now)
+            summary[key] = value
+        summary["updated_at"] = now
+        return summary
 
     async def latest_summary(self) -> Optional[Dict[str, Optional[float]]]:
-        async with self._lock:
-            if not self.last_update_ts or not self.latest_event_id:
-                return None
-            now = time.time()
-            self._purge_stale_metrics(now)
-            self._cleanup_rolling_buffer(now)
-            if now - self.last_update_ts > self.stale_timeout_seconds:
-                return None
-            return self._current_summary(now)
+        if not self.last_update_ts or not self.latest_event_id:
+            return None
+        now = time.monotonic()
+        if now - self.last_update_ts > self.stale_timeout_seconds:
+            return None
+        return self._current_summary(now)
     
-    def _cleanup_rolling_buffer(self, now: float) -> None:
-        """Remove samples older than ROLLING_WINDOW_SECONDS from rolling buffer."""
+    def _expire_rolling_samples(self, now: float) -> None:
+        """Drop rolling_samples entries recorded more than ROLLING_WINDOW_SECONDS ago."""
         cutoff = now - self.ROLLING_WINDOW_SECONDS
-        for metric in self.TRACKED_METRICS:
-            self.rolling_buffer[metric] = [
-                sample for sample in self.rolling_buffer[metric]
-                if sample["timestamp"] > cutoff
-            ]
+        expired = [
+            metric
+            for metric, (_, timestamp) in self.rolling_samples.items()
+            if timestamp <= cutoff
+        ]
+        if expired:
+            for metric in expired:
+                del self.rolling_samples[metric]
+            self._revision += 1
     
     def _get_recent_value(self, metric: str) -> Optional[float]:
         """Return the most recent non-zero sample within the rolling window."""
-        samples = self.rolling_buffer.get(metric, [])
-        if not samples:
+        sample = self.rolling_samples.get(metric)
+        if sample is None:
             return None
-        return samples[-1]["value"]
+        return sample[0]
     
+    def expire(self) -> None:
+        """Drop samples outside the rolling window and stale latest metrics.
+
+        Called once a second by periodic_tick; reads never expire data themselves.
+        """
+        now = time.monotonic()
+        self._expire_rolling_samples(now)
+        self._purge_stale_metrics(now)
+
+    def revision(self) -> int:
+        """Return a counter that changes whenever either summary may have changed."""
+        return self._revision
+
     async def get_rolling_summary(self) -> Dict[str, Optional[float]]:
         """Get summary using 1-second rolling averages."""
-        async with self._lock:
-            now = time.time()
-            self._cleanup_rolling_buffer(now)
-            return {
-                "event_id": self.latest_event_id,
-                "exit_velocity_mph": self._get_recent_value("exit_velocity_mph"),
-                "launch_angle_deg": self._get_recent_value("launch_angle_deg"),
-                "pitch_velocity_mph": self._get_recent_value("pitch_velocity_mph"),
-                "spin_rate_rpm": self._get_recent_value("spin_rate_rpm"),
-                "hit_distance_ft": self._get_recent_value("hit_distance_ft"),
-                "hangtime_sec": self._get_recent_value("hangtime_sec"),
-                "updated_at": now,
-            }
-
-
-    def _summary_for(
-        self, event_id: str, bucket: Dict[str, Optional[float]]
-    ) -> Dict[str, Optional[float]]:
-        def _latest(value: Optional[float]) -> Optional[float]:
-            return float(value) if value is not None else None
-
+        now = time.monotonic()
         return {
-            "event_id": event_id,
-            "exit_velocity_mph": _latest(bucket["exit_velocity_mph"]),
-            "launch_angle_deg": _latest(bucket["launch_angle_deg"]),
-            "pitch_velocity_mph": _latest(bucket["pitch_velocity_mph"]),
-            "spin_rate_rpm": _latest(bucket["spin_rate_rpm"]),
-            "hit_distance_ft": _latest(bucket["hit_distance_ft"]),
-            "hangtime_sec": _latest(bucket["hangtime_sec"]),
-            "updated_at": self.last_update_ts,
+            "event_id": self.latest_event_id,
+            "exit_velocity_mph": self._get_recent_value("exit_velocity_mph"),
+            "launch_angle_deg": self._get_recent_value("launch_angle_deg"),
+            "pitch_velocity_mph": self._get_recent_value("pitch_velocity_mph"),
+            "spin_rate_rpm": self._get_recent_value("spin_rate_rpm"),
+            "hit_distance_ft": self._get_recent_value("hit_distance_ft"),
+            "hangtime_sec": self._get_recent_value("hangtime_sec"),
+            "updated_at": now,
         }
 
-    def _update_latest_metrics(self, summary: Dict[str, Optional[float]]) -> None:
-        event_id = summary.get("event_id")
-        updated_at = summary.get("updated_at")
-        if event_id is None or updated_at is None:
-            return
 
-        for key in self.TRACKED_METRICS:
-            value = summary.get(key)
-            if value is not None:
-                self.latest_metrics[key] = {
-                    "value": float(value),
-                    "event_id": str(event_id),
-                    "updated_at": float(updated_at),
-                }
+    def _latest_value(self, metric: str, now: float) -> Optional[float]:
+        info = self.latest_metrics.get(metric)
+        if info is None:
+            return None
+        value, _, updated_at = info
+        if self._is_stale(updated_at, now):
+            return None
+        return value
 
     def _current_summary(self, now: float) -> Dict[str, Optional[float]]:
-        def _latest_value(metric: str) -> Optional[float]:
-            info = self.latest_metrics.get(metric)
-            if not info:
-                return None
-            updated_at = info.get("updated_at")
-            if self._is_stale(updated_at, now):
-                return None
-            return info.get("value")
-
         return {
             "event_id": self.latest_event_id,
-            "exit_velocity_mph": _latest_value("exit_velocity_mph"),
-            "launch_angle_deg": _latest_value("launch_angle_deg"),
-            "pitch_velocity_mph": _latest_value("pitch_velocity_mph"),
-            "spin_rate_rpm": _latest_value("spin_rate_rpm"),
-            "hit_distance_ft": _latest_value("hit_distance_ft"),
-            "hangtime_sec": _latest_value("hangtime_sec"),
+            "exit_velocity_mph": self._latest_value("exit_velocity_mph", now),
+            "launch_angle_deg": self._latest_value("launch_angle_deg", now),
+            "pitch_velocity_mph": self._latest_value("pitch_velocity_mph", now),
+            "spin_rate_rpm": self._latest_value("spin_rate_rpm", now),
+            "hit_distance_ft": self._latest_value("hit_distance_ft", now),
+            "hangtime_sec": self._latest_value("hangtime_sec", now),
             "updated_at": self.last_update_ts,
         }
 
     def _purge_stale_metrics(self, now: float) -> None:
-        self.latest_metrics = {
-            key: info
+        stale = [
+            key
             for key, info in self.latest_metrics.items()
-            if not self._is_stale(info.get("updated_at"), now)
-        }
+            if self._is_stale(info.updated_at, now)
+        ]
+        if stale:
+            for key in stale:
+                del self.latest_metrics[key]
+            self._revision += 1
 
     def _is_stale(self, updated_at: Optional[float], now: float) -> bool:
         return updated_at is None or now - updated_at > self.stale_timeout_seconds
 
 
+# Console echo for each processed payload (event ID is truncated to its last 6 characters)
+_CONSOLE_EVENT_TEMPLATE = (
+    "  -----------------------------\n"
+    "Event {}\n"
+    "- Pitch Velo: {} mph\n"
+    "- Spin: {} rpm\n"
+    "- Exit Velo: {} mph\n"
+    "- Launch: {}°\n"
+    "- Distance: {} ft\n"
+    "- Hangtime: {} s\n"
+    "\n"
+)
+
+
 async def process_payload(
     payload: dict,
     aggregator: MetricAggregator,
@@ -340,27 +410,17 @@ async def process_payload(
         hangtime=hangtime,
     )
     if echo_console and summary:
-        pitch_display = _format_console_metric(summary.get("pitch_velocity_mph"), 1)
-        spin_display = _format_console_metric(summary.get("spin_rate_rpm"), 0)
-        exit_display = _format_console_metric(summary.get("exit_velocity_mph"), 1)
-        launch_display = _format_console_metric(summary.get("launch_angle_deg"), 1)
-        distance_display = _format_console_metric(summary.get("hit_distance_ft"), 0)
-        hangtime_display = _format_console_metric(summary.get("hangtime_sec"), 1)
-        
-        # Use print with sys.stderr to output formatted metrics without timestamp prefixes
-        # Truncate event ID to last 6 characters for cleaner display
-        event_id_short = summary['event_id'][-6:] if summary['event_id'] else "N/A"
-        event_output = (
-            f"  -----------------------------\n"
-            f"Event {event_id_short}\n"
-            f"- Pitch Velo: {pitch_display} mph\n"
-            f"- Spin: {spin_display} rpm\n"
-            f"- Exit Velo: {exit_display} mph\n"
-            f"- Launch: {launch_display}°\n"
-            f"- Distance: {distance_display} ft\n"
-            f"- Hangtime: {hangtime_display} s\n"
-        )
-        print(event_output, file=sys.stderr, flush=True)
+        # A single write per event; periodic_tick flushes stderr in case it is
+        # block-buffered
+        sys.stderr.write(_CONSOLE_EVENT_TEMPLATE.format(
+            aggregator.latest_event_short_id or "N/A",
+            _format_console_metric(summary.get("pitch_velocity_mph"), 1),
+            _format_console_metric(summary.get("spin_rate_rpm"), 0),
+            _format_console_metric(summary.get("exit_velocity_mph"), 1),
+            _format_console_metric(summary.get("launch_angle_deg"), 1),
+            _format_console_metric(summary.get("hit_distance_ft"), 0),
+            _format_console_metric(summary.get("hangtime_sec"), 1),
+        ))
     return summary
 
 
@@ -382,6 +442,7 @@ class YakkerStreamer:
         self.echo_console = echo_console
         self.status = status
         self.payload_hooks = payload_hooks or []
+        self._hooks = _classify_payload_hooks(self.payload_hooks)
         self.min_exit_velo = min_exit_velo
 
     async def run(self) -> None:
@@ -402,9 +463,9 @@ class YakkerStreamer:
                         async for message in websocket:
                             if message.type == WSMsgType.TEXT:
                                 try:
-                                    payload = json.loads(message.data)
+                                    payload = _json_loads(message.data)
                                     await _dispatch_payload_hooks(
-                                        self.payload_hooks, payload
+                                        self._hooks, payload
                                     )
                                     await process_payload(
                                         payload,
@@ -457,27 +518,25 @@ async def demo_feed(
             "hit_data": {"ExitSpeedMPH": 95.9, "AngleDegrees": 21.1, "DistanceFeet": 321.8, "HangTimeSeconds": 3.59},
         },
     ]
+    hooks = _classify_payload_hooks(payload_hooks)
     while True:
         for sample in samples:
-            await _dispatch_payload_hooks(payload_hooks, sample)
+            await _dispatch_payload_hooks(hooks, sample)
             await process_payload(sample, aggregator, echo_console=echo_console, min_exit_velo=min_exit_velo)
             await asyncio.sleep(POLL_INTERVAL_SECONDS)
 
 
-async def periodic_updater(aggregator: MetricAggregator) -> None:
-    """Periodically clean up rolling buffer to ensure fresh averages."""
-    while True:
-        await asyncio.sleep(1.0)  # Update every second
-        try:
-            # This triggers cleanup of old samples
-            await aggregator.get_rolling_summary()
-        except Exception as exc:
-            print(f"⚠️  Error in periodic updater: {exc}", file=sys.stderr, flush=True)
-
-
 # Cached Sidearm team XML blocks (populated by fetch_sidearm_xml / load_sidearm_file)
 _sidearm_home_block: Optional[str] = None
 _sidearm_visitor_block: Optional[str] = None
+# livedata template with the Sidearm blocks spliced in, and the
+# (template, visitor block, home block) it was built from
+_composited_for: Optional[Tuple[str, Optional[str], Optional[str]]] = None
+_composited_template: Optional[str] = None
+# Encoded livedata.xml as last written by periodic_tick (None until the first write)
+_livedata_body: Optional[bytes] = None
+# Regex to match the XXX-Name-XXX data placeholders in livedata.xml.template
+_TEMPLATE_PLACEHOLDER_RE = re.compile(r"XXX-([A-Za-z]+)-XXX")
 # Regex to match the second <team ...>...</team> block in the generated XML
 _SECOND_TEAM_RE = re.compile(
     r"(</team>\s*)"          # end of 1st team block (captured so we keep it)
@@ -642,215 +701,238 @@ async def fetch_sidearm_xml(url: str) -> None:
             await asyncio.sleep(SIDEARM_FETCH_INTERVAL)
 
 
-async def update_livedata_xml(aggregator: MetricAggregator) -> None:
-    """Update livedata.xml file every second with current Yakker data."""
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(script_dir, "livedata.xml.template")
-    livedata_path = os.path.join(script_dir, "livedata.xml")
-    
-    # Read template once at startup
-    if not os.path.exists(template_path):
-        print(f"❌ Template file not found: {template_path}", file=sys.stderr, flush=True)
-        return
+def _load_livedata_template() -> Optional[str]:
+    """Read livedata.xml.template and convert its placeholders to format fields."""
+    if not os.path.exists(LIVEDATA_TEMPLATE_PATH):
+        print(f"❌ Template file not found: {LIVEDATA_TEMPLATE_PATH}", file=sys.stderr, flush=True)
+        return None
     
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
+    with open(LIVEDATA_TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        raw_template = _escape_format_braces(f.read())
+    # Turn the XXX-Name-XXX placeholders into str.format fields so each
+    # update fills all of them in a single pass
+    template_content = _TEMPLATE_PLACEHOLDER_RE.sub(r"{\1}", raw_template)
     
     print("✅ Loaded livedata.xml template", file=sys.stderr, flush=True)
+    return template_content
+
+
+def _escape_format_braces(text: str) -> str:
+    """Escape literal braces so *text* can sit inside a str.format template."""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _composite_livedata_template(template_content: str) -> str:
+    """Return the livedata template with any cached Sidearm team blocks spliced in.
+
+    The result still holds the metric format fields. It is cached in a single
+    slot keyed on the identity of the template and Sidearm blocks, which are
+    replaced rather than mutated, so the splice only reruns after a new fetch.
+    """
+    global _composited_for, _composited_template
+    visitor_block = _sidearm_visitor_block
+    home_block = _sidearm_home_block
+    cached_for = _composited_for
+    if (
+        cached_for is not None
+        and cached_for[0] is template_content
+        and cached_for[1] is visitor_block
+        and cached_for[2] is home_block
+    ):
+        return _composited_template
+
+    xml_content = template_content
+
+    # If Sidearm visitor data is cached, replace the first team block
+    # while preserving the <totals> section that holds Yakker metrics.
+    if visitor_block is not None:
+        first_team_match = _FIRST_TEAM_RE.search(xml_content)
+        if first_team_match:
+            current_first_team = first_team_match.group(1)
+            totals_match = _TOTALS_RE.search(current_first_team)
+            merged_visitor = _merge_visitor_preserve_totals(
+                _escape_format_braces(visitor_block),
+                totals_match.group(0) if totals_match else None,
+            )
+            xml_content = (
+                xml_content[: first_team_match.start(1)]
+                + merged_visitor
+                + xml_content[first_team_match.end(1) :]
+            )
+
+    # If Sidearm home data is cached, replace the second team block
+    if home_block is not None:
+        second_team_match = _SECOND_TEAM_RE.search(xml_content)
+        if second_team_match:
+            xml_content = (
+                xml_content[: second_team_match.start()]
+                + second_team_match.group(1)
+                + _escape_format_braces(home_block)
+                + xml_content[second_team_match.end() :]
+            )
+
+    _composited_for = (template_content, visitor_block, home_block)
+    _composited_template = xml_content
+    return xml_content
+
+
+def _render_livedata_xml(
+    template_content: str, summary: Optional[Dict[str, Optional[float]]]
+) -> str:
+    """Fill the livedata.xml template with Yakker data and any cached Sidearm rosters."""
+    # Replace the metric fields with actual data
+    # (placeholders shown if None or 0)
+    return _composite_livedata_template(template_content).format_map(
+        _get_formatted_metrics(summary)
+    )
+
+
+async def periodic_tick(aggregator: MetricAggregator) -> None:
+    """Once a second, expire old samples and refresh livedata.xml."""
+    global _livedata_body
+    # Read template once at startup
+    template_content = _load_livedata_template()
     
+    previous_xml: Optional[str] = None
+    # Aggregator revision and Sidearm blocks the last frame was rendered from
+    previous_inputs: Optional[Tuple[int, Optional[str], Optional[str]]] = None
+    # Tick against a fixed schedule so render time doesn't push ticks later
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
     while True:
-        await asyncio.sleep(1.0)  # Update every second
+        next_tick += 1.0
+        now = loop.time()
+        if next_tick < now:
+            # Fell more than a tick behind; start over rather than bunching
+            next_tick = now
+        await asyncio.sleep(next_tick - now)
         try:
+            # Push out console event echoes written since the last tick
+            sys.stderr.flush()
+
+            # Expiring here bumps the aggregator's revision, which is what
+            # lets the HTTP handlers serve their cached bodies
+            aggregator.expire()
+            if template_content is None:
+                continue
+
+            # Nothing the frame is built from has changed; skip rendering
+            inputs = (
+                aggregator.revision(),
+                _sidearm_visitor_block,
+                _sidearm_home_block,
+            )
+            if inputs == previous_inputs:
+                continue
+
             # Get current summary (uses 10-second stale timeout, not 1-second rolling)
             summary = await aggregator.latest_summary()
-            
-            # Format metrics for XML (use placeholders if None or 0)
-            exit_velo = _format_metric(summary.get("exit_velocity_mph") if summary else None, 1)
-            launch_angle = _format_metric(summary.get("launch_angle_deg") if summary else None, 1)
-            spin_rate = _format_metric(
-                summary.get("spin_rate_rpm") if summary else None,
-                0,
-                empty_placeholder="---- ",
-            )
-            pitch_velo = _format_metric(summary.get("pitch_velocity_mph") if summary else None, 1)
-            hit_distance = _format_metric(summary.get("hit_distance_ft") if summary else None, 0)
-            hangtime = _format_metric(summary.get("hangtime_sec") if summary else None, 1)
-            
-            # Replace the XXX placeholders with actual data
-            xml_content = re.sub(r'XXX-ExitVelo-XXX', exit_velo, template_content)
-            xml_content = re.sub(r'XXX-LaunchAngle-XXX', launch_angle, xml_content)
-            xml_content = re.sub(r'XXX-SpinRate-XXX', spin_rate, xml_content)
-            xml_content = re.sub(r'XXX-PitchVelo-XXX', pitch_velo, xml_content)
-            xml_content = re.sub(r'XXX-HitDistance-XXX', hit_distance, xml_content)
-            xml_content = re.sub(r'XXX-Hangtime-XXX', hangtime, xml_content)
-            
-            # If Sidearm visitor data is cached, replace the first team block
-            # while preserving the <totals> section that holds Yakker metrics.
-            if _sidearm_visitor_block is not None:
-                first_team_match = _FIRST_TEAM_RE.search(xml_content)
-                if first_team_match:
-                    current_first_team = first_team_match.group(1)
-                    totals_match = _TOTALS_RE.search(current_first_team)
-                    merged_visitor = _merge_visitor_preserve_totals(
-                        _sidearm_visitor_block,
-                        totals_match.group(0) if totals_match else None,
-                    )
-                    xml_content = (
-                        xml_content[: first_team_match.start(1)]
-                        + merged_visitor
-                        + xml_content[first_team_match.end(1) :]
-                    )
-
-            # If Sidearm home data is cached, replace the second team block
-            if _sidearm_home_block is not None:
-                second_team_match = _SECOND_TEAM_RE.search(xml_content)
-                if second_team_match:
-                    xml_content = (
-                        xml_content[: second_team_match.start()]
-                        + second_team_match.group(1)
-                        + _sidearm_home_block
-                        + xml_content[second_team_match.end() :]
-                    )
-
-            # Write the updated content to livedata.xml
-            with open(livedata_path, 'w', encoding='utf-8') as f:
-                f.write(xml_content)
-                
-            # Silently update - no need to log every update
-            pass
+            xml_content = _render_livedata_xml(template_content, summary)
+
+            # Nothing changed since the last write; leave the file alone
+            if xml_content == previous_xml:
+                previous_inputs = inputs
+                continue
+
+            # Write the updated content to livedata.xml atomically so readers
+            # never see a partially written file
+            _write_file_atomic(LIVEDATA_PATH, xml_content)
+            previous_xml = xml_content
+            previous_inputs = inputs
+            _livedata_body = xml_content.encode("utf-8")
         except Exception as exc:
-            print(f"⚠️  Error updating livedata.xml: {exc}", file=sys.stderr, flush=True)
+            print(f"⚠️  Error in periodic update: {exc}", file=sys.stderr, flush=True)
 
 
-def _format_metric(
-    value: Optional[float], decimals: int, empty_placeholder: str = "-- "
-) -> str:
-    """Format a metric value for ProScoreboard, showing placeholder for 0 or None."""
-    if value is None or value == 0:
-        return empty_placeholder
-    return f"{value:.{decimals}f}"
+def _write_file_atomic(path: str, content: str) -> None:
+    """Write *content* to a temp file next to *path*, then swap it into place."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Bound formatters per decimal count, so rendering skips building a format spec
+_DECIMAL_FORMATTERS: Dict[int, Callable[[float], str]] = {
+    0: "{:.0f}".format,
+    1: "{:.1f}".format,
+}
 
 
 def _format_console_metric(value: Optional[float], decimals: int) -> str:
     """Format metric for console logging, showing em dash when missing."""
     if value is None:
         return "—"
-    return f"{value:.{decimals}f}"
+    return _DECIMAL_FORMATTERS[decimals](value)
+
+
+# ProScoreboard fields as (field, summary key, bound formatter, placeholder).
+# The placeholder is shown when the value is missing or 0.
+_SCOREBOARD_FIELDS: Tuple[Tuple[str, str, Callable[[float], str], str], ...] = (
+    ("ExitVelo", "exit_velocity_mph", _DECIMAL_FORMATTERS[1], "-- "),
+    ("LaunchAngle", "launch_angle_deg", _DECIMAL_FORMATTERS[1], "-- "),
+    ("SpinRate", "spin_rate_rpm", _DECIMAL_FORMATTERS[0], "---- "),
+    ("PitchVelo", "pitch_velocity_mph", _DECIMAL_FORMATTERS[1], "-- "),
+    ("HitDistance", "hit_distance_ft", _DECIMAL_FORMATTERS[0], "-- "),
+    ("Hangtime", "hangtime_sec", _DECIMAL_FORMATTERS[1], "-- "),
+)
+_EMPTY_FORMATTED_METRICS: Dict[str, str] = {
+    "sportMode": "Custom",
+    **{field: placeholder for field, _, _, placeholder in _SCOREBOARD_FIELDS},
+}
 
 
 def _get_formatted_metrics(summary: Optional[Dict[str, Optional[float]]]) -> Dict[str, str]:
     """Extract and format metrics from summary for ProScoreboard output."""
-    exit_velo = _format_metric(summary.get("exit_velocity_mph") if summary else None, 1)
-    launch_angle = _format_metric(summary.get("launch_angle_deg") if summary else None, 1)
-    spin_rate = _format_metric(
-        summary.get("spin_rate_rpm") if summary else None,
-        0,
-        empty_placeholder="---- ",
-    )
-    pitch_velo = _format_metric(summary.get("pitch_velocity_mph") if summary else None, 1)
-    hit_distance = _format_metric(summary.get("hit_distance_ft") if summary else None, 0)
-    hangtime = _format_metric(summary.get("hangtime_sec") if summary else None, 1)
-    
-    return {
-        "sportMode": "Custom",
-        "ExitVelo": exit_velo,
-        "LaunchAngle": launch_angle,
-        "SpinRate": spin_rate,
-        "PitchVelo": pitch_velo,
-        "HitDistance": hit_distance,
-        "Hangtime": hangtime
-    }
-
-
-def build_app(
-    aggregator: MetricAggregator, status: Dict[str, str], port: int
-) -> web.Application:
-    app = web.Application()
-
-    async def get_proresenter_xml(_: web.Request) -> web.Response:
-        """Returns data in ProScoreboard/ProPresenter Datalink API format (XML)"""
-        summary = await aggregator.get_rolling_summary()
-        metrics = _get_formatted_metrics(summary)
-        
-        # Return ProScoreboard Datalink API format in XML
-        xml_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<scoreboard>
-    <sportMode>{metrics["sportMode"]}</sportMode>
-    <ExitVelo>{metrics["ExitVelo"]}</ExitVelo>
-    <LaunchAngle>{metrics["LaunchAngle"]}</LaunchAngle>
-    <SpinRate>{metrics["SpinRate"]}</SpinRate>
-    <PitchVelo>{metrics["PitchVelo"]}</PitchVelo>
-    <HitDistance>{metrics["HitDistance"]}</HitDistance>
-    <Hangtime>{metrics["Hangtime"]}</Hangtime>
-</scoreboard>"""
-        
-        return web.Response(
-            text=xml_content,
-            content_type="application/xml"
-        )
-    
-    async def get_livedata_xml(_: web.Request) -> web.Response:
-        """Returns the livedata.xml file"""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        livedata_path = os.path.join(script_dir, "livedata.xml")
-        
-        try:
-            with open(livedata_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            return web.Response(
-                text=xml_content,
-                content_type="application/xml"
-            )
-        except FileNotFoundError:
-            return web.Response(
-                text="livedata.xml not found",
-                status=404
-            )
-    
-    async def get_html_view(_: web.Request) -> web.Response:
-        """Returns HTML view with black background and white monospace text"""
-        summary = await aggregator.get_rolling_summary()
-        metrics = _get_formatted_metrics(summary)
-        
-        html_content = f"""<!DOCTYPE html>
+    if not summary:
+        return dict(_EMPTY_FORMATTED_METRICS)
+    metrics = {"sportMode": "Custom"}
+    for field, key, formatter, placeholder in _SCOREBOARD_FIELDS:
+        value = summary.get(key)
+        metrics[field] = formatter(value) if value else placeholder
+    return metrics
+
+
+# Static page for the live web view, pre-encoded once; the six %s slots
+# take the formatted metrics in _HTML_METRIC_KEYS order
+_HTML_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
     <meta http-equiv="refresh" content="1">
     <title>Yakker Stream - Live Data</title>
     <style>
-        body {{
+        body {
             background-color: #000000;
             color: #ffffff;
             font-family: 'Courier New', Courier, monospace;
             padding: 40px;
             margin: 0;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 800px;
             margin: 0 auto;
-        }}
-        h1 {{
+        }
+        h1 {
             font-size: 36px;
             margin-bottom: 40px;
             text-align: center;
-        }}
-        .metric {{
+        }
+        .metric {
             font-size: 28px;
             margin: 20px 0;
             padding: 15px;
             border: 2px solid #ffffff;
-        }}
-        .metric-label {{
+        }
+        .metric-label {
             display: inline-block;
             width: 250px;
-        }}
-        .metric-value {{
+        }
+        .metric-value {
             display: inline-block;
             font-weight: bold;
             font-size: 32px;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -858,35 +940,110 @@ def build_app(
         <h1>YAKKER STREAM - LIVE DATA</h1>
         <div class="metric">
             <span class="metric-label">Exit Velocity:</span>
-            <span class="metric-value">{metrics["ExitVelo"]} mph</span>
+            <span class="metric-value">%s mph</span>
         </div>
         <div class="metric">
             <span class="metric-label">Launch Angle:</span>
-            <span class="metric-value">{metrics["LaunchAngle"]}°</span>
+            <span class="metric-value">%s°</span>
         </div>
         <div class="metric">
             <span class="metric-label">Spin Rate:</span>
-            <span class="metric-value">{metrics["SpinRate"]} rpm</span>
+            <span class="metric-value">%s rpm</span>
         </div>
         <div class="metric">
             <span class="metric-label">Pitch Velocity:</span>
-            <span class="metric-value">{metrics["PitchVelo"]} mph</span>
+            <span class="metric-value">%s mph</span>
         </div>
         <div class="metric">
             <span class="metric-label">Hit Distance:</span>
-            <span class="metric-value">{metrics["HitDistance"]} ft</span>
+            <span class="metric-value">%s ft</span>
         </div>
         <div class="metric">
             <span class="metric-label">Hang Time:</span>
-            <span class="metric-value">{metrics["Hangtime"]} sec</span>
+            <span class="metric-value">%s sec</span>
         </div>
     </div>
 </body>
-</html>"""
-        
+</html>""".encode("utf-8")
+_HTML_METRIC_KEYS = tuple(field for field, _, _, _ in _SCOREBOARD_FIELDS)
+# The page refreshes itself every second, so never let the browser cache it
+_NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+
+def build_app(
+    aggregator: MetricAggregator, status: Dict[str, str], port: int
+) -> web.Application:
+    app = web.Application()
+
+    # Rendered bodies per route, reused until the rolling summary changes
+    body_cache: Dict[str, Tuple[int, bytes]] = {}
+
+    async def _rolling_body(
+        route: str, render: Callable[[Dict[str, str]], bytes]
+    ) -> bytes:
+        revision = aggregator.revision()
+        cached = body_cache.get(route)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        summary = await aggregator.get_rolling_summary()
+        body = render(_get_formatted_metrics(summary))
+        body_cache[route] = (revision, body)
+        return body
+
+    def _render_proresenter_xml(metrics: Dict[str, str]) -> bytes:
+        # ProScoreboard Datalink API format in XML
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<scoreboard>
+    <sportMode>{metrics["sportMode"]}</sportMode>
+    <ExitVelo>{metrics["ExitVelo"]}</ExitVelo>
+    <LaunchAngle>{metrics["LaunchAngle"]}</LaunchAngle>
+    <SpinRate>{metrics["SpinRate"]}</SpinRate>
+    <PitchVelo>{metrics["PitchVelo"]}</PitchVelo>
+    <HitDistance>{metrics["HitDistance"]}</HitDistance>
+    <Hangtime>{metrics["Hangtime"]}</Hangtime>
+</scoreboard>""".encode("utf-8")
+
+    def _render_html_view(metrics: Dict[str, str]) -> bytes:
+        return _HTML_TEMPLATE % tuple(
+            metrics[key].encode("utf-8") for key in _HTML_METRIC_KEYS
+        )
+
+    async def get_proresenter_xml(_: web.Request) -> web.Response:
+        """Returns data in ProScoreboard/ProPresenter Datalink API format (XML)"""
+        body = await _rolling_body("data.xml", _render_proresenter_xml)
+        return web.Response(
+            body=body,
+            content_type="application/xml",
+            charset="utf-8",
+        )
+    
+    async def get_livedata_xml(_: web.Request) -> web.Response:
+        """Returns the livedata.xml file"""
+        # Serve what periodic_tick last wrote; only read the file before then
+        body = _livedata_body
+        if body is None:
+            try:
+                with open(LIVEDATA_PATH, 'rb') as f:
+                    body = f.read()
+            except FileNotFoundError:
+                return web.Response(
+                    text="livedata.xml not found",
+                    status=404
+                )
         return web.Response(
-            text=html_content,
-            content_type="text/html"
+            body=body,
+            content_type="application/xml",
+            charset="utf-8",
+        )
+    
+    async def get_html_view(_: web.Request) -> web.Response:
+        """Returns HTML view with black background and white monospace text"""
+        body = await _rolling_body("html", _render_html_view)
+        return web.Response(
+            body=body,
+            content_type="text/html",
+            charset="utf-8",
+            headers=_NO_STORE_HEADERS,
         )
 
     app.add_routes([
@@ -976,11 +1133,8 @@ async def main() -> None:
             # Windows compatibility; not expected on Mac.
             signal.signal(sig, lambda *_: stop_event.set())
 
-    # Start periodic updater task
-    updater_task = asyncio.create_task(periodic_updater(aggregator))
-    
-    # Start livedata.xml updater task
-    xml_updater_task = asyncio.create_task(update_livedata_xml(aggregator))
+    # Start the 1 Hz task that expires old samples and updates livedata.xml
+    tick_task = asyncio.create_task(periodic_tick(aggregator))
 
     # Start Sidearm XML fetcher if a URL was provided, or load from file
     sidearm_task: Optional[asyncio.Task] = None
@@ -1006,17 +1160,12 @@ async def main() -> None:
         )
 
     await stop_event.wait()
-    updater_task.cancel()
-    xml_updater_task.cancel()
+    tick_task.cancel()
     if sidearm_task is not None:
         sidearm_task.cancel()
     feed_task.cancel()
     try:
-        await updater_task
-    except asyncio.CancelledError:
-        pass
-    try:
-        await xml_updater_task
+        await tick_task
     except asyncio.CancelledError:
         pass
     if sidearm_task is not None:
@@ -1032,8 +1181,19 @@ async def main() -> None:
     print("✅ Yakker stream shut down.", file=sys.stderr, flush=True)
 
 
+def _run_main() -> None:
+    if uvloop is None:
+        asyncio.run(main())
+    elif hasattr(uvloop, "run"):
+        uvloop.run(main())
+    else:
+        # uvloop < 0.18 has no run(); install its policy for asyncio.run
+        uvloop.install()
+        asyncio.run(main())
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        _run_main()
     except KeyboardInterrupt:
         sys.exit(0)